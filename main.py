@@ -6,22 +6,64 @@ the audio, generates a summary of the transcript, and logs window
 activity. It saves the raw transcript, the summary, and the window
 activity log to disk using a user-provided prefix. Use the --duration
 option to control how long the recording and tracking run.
+
+Recording and activity tracking run side by side, and the transcript
+is summarized chunk by chunk while it is still being produced, so a
+session takes roughly the recording duration plus the processing time
+rather than running every stage back to back.
+
+The recorder, transcriber, summarizer and tracker modules are imported
+only when a session starts, so `--help` and spawned worker processes do
+not pay for loading OpenCV, the Whisper backend or the OpenAI SDK.
 """
 
 from __future__ import annotations
 
 import argparse
 import json
-from typing import Tuple
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Iterator, List, Tuple
+
+
+def _write_result(path: str, write: Callable[[Any, Any], Any]) -> Callable[[Future], None]:
+    """
+    Build a done-callback that writes a future's result to ``path``.
+
+    Failed futures are left alone so the error surfaces where the result
+    is awaited.
+    """
+    def callback(future: Future) -> None:
+        if future.exception() is None:
+            with open(path, "w", encoding="utf-8") as f:
+                write(f, future.result())
+    return callback
+
+
+def _stream_transcript(audio_file: str, transcript_file: str) -> Iterator[str]:
+    """
+    Yield transcript segments as they are decoded, then write the full transcript.
+    """
+    from transcriber import transcribe_segments
 
-from recorder import record_audio_and_screen
-from transcriber import transcribe
-from summarizer import summarize_text
-from tracker import track_activity
+    texts: List[str] = []
+    for text in transcribe_segments(audio_file):
+        texts.append(text)
+        yield text
+    with open(transcript_file, "w", encoding="utf-8") as tf:
+        tf.write(" ".join(texts))
 
 
+def _prettify_json(path: str) -> None:
+    """
+    Rewrite a JSON file in place with two-space indentation.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
 
-def run_session(duration: int, prefix: str) -> Tuple[str, str, str, str]:
+
+def run_session(duration: int, prefix: str, pretty: bool = False) -> Tuple[str, str, str, str]:
     """
     Run a complete recording/transcription/summarization/tracking session.
 
@@ -31,36 +73,41 @@ def run_session(duration: int, prefix: str) -> Tuple[str, str, str, str]:
         Duration in seconds for recording and tracking.
     prefix: str
         Prefix for all output files (audio, video, transcript, summary, activity).
+    pretty: bool, optional
+        Reformat the activity log with indentation once the session ends.
+        Defaults to False, which keeps one compact record per line.
 
     Returns
     -------
     Tuple[str, str, str, str]
         Paths to the audio file, video file, transcript, and summary files.
     """
+    from recorder import record_audio_and_screen
+    from summarizer import summarize_segments
+    from tracker import log_activity
+
     audio_file = f"{prefix}_audio.wav"
-    video_file = f"{prefix}_screen.avi"
+    video_file = f"{prefix}_screen.mp4"
     transcript_file = f"{prefix}_transcript.txt"
     summary_file = f"{prefix}_summary.txt"
     activity_file = f"{prefix}_activity.json"
 
-    # Record audio and screen concurrently
-    record_audio_and_screen(audio_file, video_file, duration)
-
-    # Transcribe the audio
-    transcript = transcribe(audio_file)
-    with open(transcript_file, "w", encoding="utf-8") as tf:
-        tf.write(transcript)
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        # Record audio and screen while tracking window activity over the same period
+        recording = executor.submit(record_audio_and_screen, audio_file, video_file, duration)
+        activity = executor.submit(log_activity, activity_file, duration)
 
-    # Summarize the transcript
-    summary = summarize_text(transcript)
-    with open(summary_file, "w", encoding="utf-8") as sf:
-        sf.write(summary)
+        # Once the audio exists, summarize transcript chunks while later segments are still decoding
+        recording.result()
+        summary = executor.submit(summarize_segments, _stream_transcript(audio_file, transcript_file))
+        summary.add_done_callback(_write_result(summary_file, lambda sf, text: sf.write(text)))
 
-    # Track window activity during the recording period
-    activity = track_activity(duration)
-    with open(activity_file, "w", encoding="utf-8") as af:
-        json.dump(activity, af, indent=2)
+        # Surface any stage failure; leaving the block waits for the file writes
+        for future in (activity, summary):
+            future.result()
 
+    if pretty:
+        _prettify_json(activity_file)
     print(f"Session complete.\nAudio: {audio_file}\nVideo: {video_file}\nTranscript: {transcript_file}\nSummary: {summary_file}\nActivity log: {activity_file}")
     return audio_file, video_file, transcript_file, summary_file
 
@@ -70,8 +117,9 @@ def main() -> None:
     parser = argparse.ArgumentParser(description="Office Assistant prototype: record, transcribe, summarize, and log activity.")
     parser.add_argument("--duration", type=int, default=60, help="Duration in seconds to record and track.")
     parser.add_argument("--prefix", type=str, default="session", help="Prefix for output files.")
+    parser.add_argument("--pretty", action="store_true", help="Indent the activity log JSON after the session.")
     args = parser.parse_args()
-    run_session(args.duration, args.prefix)
+    run_session(args.duration, args.prefix, args.pretty)
 
 
 if __name__ == "__main__":
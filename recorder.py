@@ -3,9 +3,15 @@ Recorder module for the Office Assistant prototype.
 
 This module provides functions to record the user's screen and microphone
 simultaneously. The recordings are saved to disk as separate audio and
-video files. Screen capture is performed via PyAutoGUI and OpenCV,
-while audio capture relies on the sounddevice library. Recording
-functions can be composed using threads to run concurrently.
+video files. Screen capture is performed via mss and OpenCV,
+while audio capture relies on the sounddevice library. Screen
+grabbing and encoding each run in their own process so that neither
+competes with audio capture for the GIL. Frames are handed between the
+two through a fixed ring of shared-memory slots, so no per-frame
+buffers are allocated while recording. Video is encoded by an FFmpeg
+subprocess, which must be available on the PATH; a hardware H.264
+encoder (Intel QuickSync, NVIDIA NVENC or AMD AMF) is used when one
+works on this machine, with software encoders as a fallback.
 
 The functions exposed here are simple wrappers with reasonable
 defaults. They can be imported and called from a larger application
@@ -14,19 +20,74 @@ without modification.
 
 from __future__ import annotations
 
+import functools
+import multiprocessing as mp
+import os
+import queue
+import shutil
+import struct
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+from multiprocessing.process import BaseProcess
+from multiprocessing.synchronize import Event
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
 import cv2
+import mss
 import numpy as np
-import pyautogui
 import sounddevice as sd
-import wave
-import threading
-from typing import Tuple
+from numba import njit, prange
+
+# Number of shared-memory frame slots between the capture and encoder processes
+FRAME_SLOTS = 8
+# Seconds a worker blocks on a slot queue before checking whether its peer has failed
+WORKER_POLL_INTERVAL = 0.5
+# Seconds surviving workers get to wind down after one fails before they are terminated
+WORKER_SHUTDOWN_GRACE = 5.0
+# Frame height above which colour conversion is offloaded to OpenCL; below it the upload dominates
+OPENCL_MIN_HEIGHT = 1440
+# Seconds an encoder probe may take before the encoder is treated as unusable
+CODEC_PROBE_TIMEOUT = 5.0
+# FFmpeg video encoders in order of preference, with the options used for each
+VIDEO_CODECS: List[Tuple[str, List[str]]] = [
+    ("h264_qsv", ["-preset", "veryfast", "-global_quality", "25", "-pix_fmt", "nv12"]),
+    ("h264_nvenc", ["-preset", "fast", "-cq", "25", "-pix_fmt", "yuv420p"]),
+    ("h264_amf", ["-quality", "speed", "-pix_fmt", "yuv420p"]),
+    ("libx264", ["-preset", "veryfast", "-crf", "25", "-pix_fmt", "yuv420p"]),
+    ("mpeg4", ["-q:v", "5", "-pix_fmt", "yuv420p"]),
+]
+
+
+def _wav_header(channels: int, fs: int, data_size: int) -> bytes:
+    """
+    Build the 44-byte RIFF header of a 16-bit PCM WAV file.
+    """
+    sampwidth = 2  # 16-bit audio uses 2 bytes per sample
+    block_align = channels * sampwidth
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 36 + data_size, b"WAVE",
+        b"fmt ", 16, 1, channels, fs, fs * block_align, block_align, sampwidth * 8,
+        b"data", data_size,
+    )
 
 
-def record_audio(filename: str, duration: int, fs: int = 44100, channels: int = 2) -> None:
+def record_audio(
+    filename: str,
+    duration: int,
+    fs: int = 44100,
+    channels: int = 2,
+    stop_event: Optional[threading.Event] = None,
+) -> None:
     """
     Record audio from the default microphone and write it to a WAV file.
 
+    Samples are streamed to disk block by block as they arrive, so memory
+    use does not grow with the recording duration.
+
     Parameters
     ----------
     filename: str
@@ -38,44 +99,370 @@ def record_audio(filename: str, duration: int, fs: int = 44100, channels: int =
         a typical CD-quality sample rate.
     channels: int, optional
         Number of audio channels. Defaults to 2 for stereo recording.
+    stop_event: threading.Event, optional
+        Event that ends the recording early when set from another thread.
     """
     print(f"Recording audio to {filename} for {duration} seconds ...")
-    # Record audio using sounddevice; returns a NumPy array
-    audio = sd.rec(int(duration * fs), samplerate=fs, channels=channels, dtype='int16')
-    sd.wait()
-    # Write the recording to a WAV file using the wave module
-    with wave.open(filename, 'wb') as wf:
-        wf.setnchannels(channels)
-        wf.setsampwidth(2)  # 16-bit audio uses 2 bytes per sample
-        wf.setframerate(fs)
-        wf.writeframes(audio.tobytes())
+    stop = stop_event if stop_event is not None else threading.Event()
+    fd = os.open(filename, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0))
+    data_size = 0
+    try:
+        # Placeholder header; the sizes are patched in once recording stops
+        os.write(fd, _wav_header(channels, fs, 0))
+
+        def callback(indata: np.ndarray, frames: int, time_info: Any, status: sd.CallbackFlags) -> None:
+            nonlocal data_size
+            data_size += os.write(fd, indata.tobytes())
+
+        # Each block is appended to the WAV file from the stream's callback
+        with sd.InputStream(samplerate=fs, channels=channels, dtype='int16', blocksize=4096, callback=callback):
+            stop.wait(duration)
+        # os.pwrite is POSIX-only, so seek back explicitly to rewrite the header
+        os.lseek(fd, 0, os.SEEK_SET)
+        os.write(fd, _wav_header(channels, fs, data_size))
+    finally:
+        os.close(fd)
     print(f"Audio saved: {filename}")
 
 
+@njit(parallel=True, fastmath=True, cache=True)
+def bgra_to_bgr(src: np.ndarray, dst: np.ndarray) -> None:
+    """
+    Pack a BGRA frame into a preallocated BGR array, dropping the alpha channel.
+
+    Rows are processed in parallel. ``dst`` must have the same height and
+    width as ``src`` and three channels.
+    """
+    height, width = src.shape[0], src.shape[1]
+    for y in prange(height):
+        for x in range(width):
+            dst[y, x, 0] = src[y, x, 0]
+            dst[y, x, 1] = src[y, x, 1]
+            dst[y, x, 2] = src[y, x, 2]
+
+
+def _get_slot(slots: "mp.Queue[Optional[int]]", abort: Event) -> Optional[int]:
+    """
+    Take the next slot index from a queue, or return ``None`` once ``abort`` is set.
+
+    The queue is polled with a timeout so a worker never waits forever on a
+    peer that has died.
+    """
+    while True:
+        try:
+            return slots.get(timeout=WORKER_POLL_INTERVAL)
+        except queue.Empty:
+            if abort.is_set():
+                return None
+
+
+def _capture_frames(
+    shm_name: str,
+    free_slots: "mp.Queue[int]",
+    filled_slots: "mp.Queue[Optional[int]]",
+    monitor: Dict[str, int],
+    screen_size: Tuple[int, int],
+    duration: int,
+    fps: int,
+    ready: Event,
+    go: Event,
+    start_time: Any,
+    abort: Event,
+) -> None:
+    """
+    Grab raw BGRA screenshots at a fixed rate into shared-memory frame slots.
+
+    Runs in its own process. Once set up it signals ``ready`` and waits for
+    ``go``; grabs are then scheduled from the shared ``start_time`` value so
+    the video lines up with the audio. Each grab is copied into a slot taken
+    from ``free_slots`` and the slot index is pushed onto ``filled_slots``;
+    ``screen_size`` is the pixel size of a grab, not of the monitor dict.
+    A ``None`` sentinel is pushed once the recording duration has elapsed,
+    or early if ``abort`` is set; a failure here sets ``abort`` itself.
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    width, height = screen_size
+    slots = np.ndarray((FRAME_SLOTS, height * width * 4), dtype=np.uint8, buffer=shm.buf)
+    # Keep a single mss instance alive so its internal grab buffer is reused
+    sct = mss.mss()
+    ready.set()
+    go.wait()
+    start = start_time.value
+    try:
+        for i in range(int(duration * fps)):
+            if abort.is_set():
+                break
+            # Pace grabs against a fixed schedule so slow frames don't accumulate drift
+            next_t = start + i / fps
+            time.sleep(max(0.0, next_t - time.monotonic()))
+            img = sct.grab(monitor)
+            slot = _get_slot(free_slots, abort)
+            if slot is None:
+                break
+            slots[slot] = np.frombuffer(img.raw, dtype=np.uint8)
+            filled_slots.put(slot)
+    except BaseException:
+        abort.set()
+        raise
+    finally:
+        filled_slots.put(None)
+        sct.close()
+        # Views into the segment must be released before it can be closed
+        del slots
+        shm.close()
+
+
+def _ffmpeg_path() -> str:
+    """
+    Locate the FFmpeg executable.
+
+    Raises
+    ------
+    RuntimeError
+        If FFmpeg cannot be found on the PATH.
+    """
+    ffmpeg = shutil.which("ffmpeg")
+    if not ffmpeg:
+        raise RuntimeError("ffmpeg executable not found. Please install FFmpeg and make sure it is on the PATH.")
+    return ffmpeg
+
+
+@functools.lru_cache(maxsize=4)
+def _pick_video_codec(width: int, height: int) -> Tuple[str, List[str]]:
+    """
+    Return the first encoder in ``VIDEO_CODECS`` that can encode a frame of this size here.
+
+    Hardware encoders are often compiled into FFmpeg without a usable
+    device, or reject large resolutions, so each candidate is tried on a
+    one-frame synthetic clip at the real screen size. A probe that runs
+    longer than ``CODEC_PROBE_TIMEOUT``, as happens when a hardware driver
+    hangs during initialization, counts as unusable.
+    """
+    ffmpeg = _ffmpeg_path()
+    for codec, options in VIDEO_CODECS:
+        try:
+            probe = subprocess.run(
+                [ffmpeg, "-hide_banner", "-loglevel", "error", "-f", "lavfi", "-i", f"color=black:s={width}x{height}",
+                 "-frames:v", "1", "-c:v", codec, *options, "-f", "null", "-"],
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=CODEC_PROBE_TIMEOUT,
+            )
+        except subprocess.TimeoutExpired:
+            continue
+        if probe.returncode == 0:
+            return codec, options
+    raise RuntimeError(f"None of the supported FFmpeg video encoders can encode {width}x{height} video on this system.")
+
+
+def _encode_frames(
+    shm_name: str,
+    free_slots: "mp.Queue[int]",
+    filled_slots: "mp.Queue[Optional[int]]",
+    filename: str,
+    screen_size: Tuple[int, int],
+    fps: int,
+    codec: Tuple[str, List[str]],
+    ready: Event,
+    abort: Event,
+) -> None:
+    """
+    Convert BGRA screenshots from shared-memory slots to BGR and pipe them to FFmpeg.
+
+    Runs in its own process, signalling ``ready`` once FFmpeg and the frame
+    buffers are set up, until a ``None`` sentinel arrives, returning each
+    slot to ``free_slots`` once it has been consumed. ``codec`` is an
+    encoder name and its options, as picked from ``VIDEO_CODECS``. The
+    process stops early once ``abort`` is set, and sets it itself if
+    encoding fails.
+
+    Raises
+    ------
+    RuntimeError
+        If FFmpeg exits early or with a non-zero status.
+    """
+    width, height = screen_size
+    # Compile the kernel before signalling ready so the JIT cost is not paid during the recording
+    bgra_to_bgr(np.zeros((1, 1, 4), dtype=np.uint8), np.empty((1, 1, 3), dtype=np.uint8))
+    shm = shared_memory.SharedMemory(name=shm_name)
+    slots = np.ndarray((FRAME_SLOTS, height, width, 4), dtype=np.uint8, buffer=shm.buf)
+    codec_name, codec_options = codec
+    # FFmpeg reads raw BGR frames from stdin and does all encoding in its own process
+    ffmpeg = subprocess.Popen(
+        [_ffmpeg_path(), "-hide_banner", "-loglevel", "error", "-y",
+         "-f", "rawvideo", "-pix_fmt", "bgr24", "-s", f"{width}x{height}", "-r", str(fps), "-i", "-",
+         "-c:v", codec_name, *codec_options, filename],
+        stdin=subprocess.PIPE,
+    )
+    # Single BGR buffer reused for every frame
+    use_opencl = height > OPENCL_MIN_HEIGHT and cv2.ocl.haveOpenCL()
+    if use_opencl:
+        cv2.ocl.setUseOpenCL(True)
+        gpu_frame = cv2.UMat(height, width, cv2.CV_8UC3)
+    frame = np.empty((height, width, 3), dtype=np.uint8)
+    bgra: Optional[np.ndarray] = None
+    pipe_broken = False
+    ready.set()
+    try:
+        while True:
+            slot = _get_slot(filled_slots, abort)
+            if slot is None:
+                break
+            bgra = slots[slot]
+            if use_opencl:
+                cv2.cvtColor(cv2.UMat(bgra), cv2.COLOR_BGRA2BGR, dst=gpu_frame)
+                frame = gpu_frame.get()
+            else:
+                bgra_to_bgr(bgra, frame)
+            free_slots.put(slot)
+            ffmpeg.stdin.write(frame)
+    except BrokenPipeError:
+        # FFmpeg exited mid-recording; its status is reported below
+        pipe_broken = True
+    except BaseException:
+        abort.set()
+        raise
+    finally:
+        try:
+            ffmpeg.stdin.close()
+        except BrokenPipeError:
+            pipe_broken = True
+        returncode = ffmpeg.wait()
+        # Views into the segment must be released before it can be closed
+        del bgra, slots
+        shm.close()
+    if pipe_broken or returncode != 0:
+        abort.set()
+        raise RuntimeError(f"ffmpeg ({codec_name}) failed while encoding {filename} (exit code {returncode}).")
+
+
+def _wait_ready(processes: Sequence[BaseProcess], ready: Sequence[Event]) -> None:
+    """
+    Block until every worker has signalled that its setup is complete.
+
+    Raises
+    ------
+    RuntimeError
+        If a worker exits before becoming ready.
+    """
+    while not all(event.wait(0.1) for event in ready):
+        if not all(process.is_alive() for process in processes):
+            raise RuntimeError("A screen recording process exited during startup.")
+
+
+def _join_workers(processes: Sequence[BaseProcess], abort: Event) -> None:
+    """
+    Wait for the screen recording workers, stopping the rest if one fails.
+
+    When a worker exits with an error, ``abort`` is set so its peer winds
+    down; any worker still running ``WORKER_SHUTDOWN_GRACE`` seconds later
+    is terminated.
+
+    Raises
+    ------
+    RuntimeError
+        If any worker did not exit cleanly.
+    """
+    deadline: Optional[float] = None
+    while any(process.is_alive() for process in processes):
+        if deadline is None and any(process.exitcode for process in processes):
+            abort.set()
+            deadline = time.monotonic() + WORKER_SHUTDOWN_GRACE
+        if deadline is not None and time.monotonic() > deadline:
+            for process in processes:
+                process.terminate()
+        for process in processes:
+            process.join(timeout=0.1)
+    failed = [f"{process.name} (exit code {process.exitcode})" for process in processes if process.exitcode != 0]
+    if failed:
+        raise RuntimeError(f"Screen recording failed: {', '.join(failed)}.")
+
+
+@contextmanager
+def _screen_recording(filename: str, duration: int, fps: int) -> Iterator[None]:
+    """
+    Run the capture and encoder processes for a screen recording.
+
+    The processes start on entry, and the block is only entered once both
+    have finished their (slow) imports and setup, with the capture clock
+    starting at that moment; this keeps the video aligned with whatever the
+    block records. Leaving the block waits for them to finish, raising
+    RuntimeError if either failed, and releases the shared frame slots.
+    """
+    with mss.mss() as sct:
+        monitor: Dict[str, Any] = dict(sct.monitors[1])
+        # Grabs come back at physical resolution, which on HiDPI displays is a multiple of the
+        # logical monitor size, so size every buffer from a real grab
+        sample = sct.grab(monitor)
+    screen_size = (sample.width, sample.height)
+    # Probe encoders before capture starts so the first frames aren't held up
+    codec = _pick_video_codec(*screen_size)
+    # Preallocated ring of frame slots reused for the whole recording
+    shm = shared_memory.SharedMemory(create=True, size=FRAME_SLOTS * sample.width * sample.height * 4)
+    try:
+        # spawn avoids inheriting OpenCV/mss state through fork on every platform
+        ctx = mp.get_context("spawn")
+        free_slots = ctx.Queue()
+        filled_slots = ctx.Queue()
+        for slot in range(FRAME_SLOTS):
+            free_slots.put(slot)
+        ready = [ctx.Event(), ctx.Event()]
+        go = ctx.Event()
+        abort = ctx.Event()
+        start_time = ctx.Value("d", 0.0)
+        processes = [
+            ctx.Process(
+                name="screen-capture",
+                target=_capture_frames,
+                args=(shm.name, free_slots, filled_slots, monitor, screen_size, duration, fps, ready[0], go, start_time,
+                      abort),
+            ),
+            ctx.Process(
+                name="screen-encoder",
+                target=_encode_frames,
+                args=(shm.name, free_slots, filled_slots, filename, screen_size, fps, codec,
+                      ready[1], abort),
+            ),
+        ]
+        for process in processes:
+            process.start()
+        try:
+            _wait_ready(processes, ready)
+        except BaseException:
+            for process in processes:
+                process.terminate()
+                process.join()
+            raise
+        try:
+            # time.monotonic is system-wide, so the capture process can schedule against it directly
+            start_time.value = time.monotonic()
+            go.set()
+            yield
+        except BaseException:
+            # Whatever ran in the block failed; stop the screen recording as well
+            abort.set()
+            raise
+        finally:
+            _join_workers(processes, abort)
+    finally:
+        shm.close()
+        shm.unlink()
+
+
 def record_screen(filename: str, duration: int, fps: int = 20) -> None:
     """
-    Record a video of the entire screen and save to an AVI file.
+    Record a video of the entire screen and save to an MP4 file.
 
     Parameters
     ----------
     filename: str
-        Output AVI file path.
+        Output MP4 file path.
     duration: int
         Duration to record in seconds.
     fps: int, optional
         Frames per second for the capture. Defaults to 20.
     """
-    screen_size = pyautogui.size()
-    # Define the codec and create the VideoWriter object. XVID is widely supported.
-    fourcc = cv2.VideoWriter_fourcc(*"XVID")
-    out = cv2.VideoWriter(filename, fourcc, fps, screen_size)
     print(f"Recording screen to {filename} for {duration} seconds ...")
-    for _ in range(int(duration * fps)):
-        # Take a screenshot and convert the PIL image to a NumPy array
-        img = pyautogui.screenshot()
-        frame = cv2.cvtColor(np.array(img), cv2.COLOR_BGR2RGB)
-        out.write(frame)
-    out.release()
+    with _screen_recording(filename, duration, fps):
+        pass
     print(f"Screen recording saved: {filename}")
 
 
@@ -83,12 +470,15 @@ def record_audio_and_screen(audio_file: str, video_file: str, duration: int) ->
     """
     Record both audio and screen concurrently.
 
+    Audio is captured in the calling process while the screen is grabbed
+    and encoded in two separate worker processes.
+
     Parameters
     ----------
     audio_file: str
         Filename for the audio recording (WAV).
     video_file: str
-        Filename for the screen recording (AVI).
+        Filename for the screen recording (MP4).
     duration: int
         Duration to record in seconds.
 
@@ -97,10 +487,8 @@ def record_audio_and_screen(audio_file: str, video_file: str, duration: int) ->
     Tuple[str, str]
         A tuple of the audio and video file names once recording completes.
     """
-    audio_thread = threading.Thread(target=record_audio, args=(audio_file, duration))
-    video_thread = threading.Thread(target=record_screen, args=(video_file, duration))
-    audio_thread.start()
-    video_thread.start()
-    audio_thread.join()
-    video_thread.join()
-    return audio_file, video_file
\ No newline at end of file
+    print(f"Recording screen to {video_file} for {duration} seconds ...")
+    with _screen_recording(video_file, duration, fps=20):
+        record_audio(audio_file, duration)
+    print(f"Screen recording saved: {video_file}")
+    return audio_file, video_file
@@ -1,19 +1,77 @@
 """
 Summarizer module for the Office Assistant prototype.
 
-This module wraps the OpenAI ChatCompletion API to provide a simple
-summarization function. Given a block of text, it produces a short
-summary describing the key points. To use this module, an
+This module wraps the OpenAI chat completions API to provide simple
+summarization functions. Given a block of text, summarize_text produces
+a short summary describing the key points. For long or still-arriving
+transcripts, summarize_segments summarizes fixed-size chunks as they
+become available and then combines the partial summaries, which keeps
+each request within the model's context window. To use this module, an
 OpenAI API key must be available via the OPENAI_API_KEY environment
-variable. See https://beta.openai.com/ for more information and to
-generate API keys.
+variable when the module is imported. See https://beta.openai.com/ for
+more information and to generate API keys. A single client with a
+pooled HTTP/2 connection is shared by all requests, so consecutive
+calls skip the connection and TLS setup. The client, and the OpenAI SDK
+itself, are only loaded when the first summary is requested.
 """
 
 from __future__ import annotations
 
+import functools
 import os
-from typing import Optional
-import openai
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Iterable, List, Optional
+
+if TYPE_CHECKING:
+    from openai import OpenAI
+
+# Rough characters-per-token ratio for English text, used to size chunks
+CHARS_PER_TOKEN = 4
+
+_SUMMARY_PROMPT = "You are a helpful assistant that summarizes meeting transcripts."
+_COMBINE_PROMPT = (
+    "You are a helpful assistant that combines partial summaries of consecutive "
+    "parts of one meeting transcript into a single summary."
+)
+
+_API_KEY: Optional[str] = os.getenv("OPENAI_API_KEY")
+
+
+@functools.lru_cache(maxsize=1)
+def _get_client() -> OpenAI:
+    """
+    Create the shared OpenAI client on first use.
+    """
+    import httpx
+    from openai import OpenAI
+
+    return OpenAI(api_key=_API_KEY, http_client=httpx.Client(http2=True, timeout=60))
+
+
+def _complete(system_prompt: str, text: str, max_tokens: int, model: str) -> str:
+    """
+    Send one chat completion request and collect the streamed reply.
+
+    Raises
+    ------
+    RuntimeError
+        If the OPENAI_API_KEY environment variable is not set.
+    """
+    if not _API_KEY:
+        raise RuntimeError("OPENAI_API_KEY environment variable not set. Please set it to your OpenAI API key.")
+    response = _get_client().chat.completions.create(
+        model=model,
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": text},
+        ],
+        max_tokens=max_tokens,
+        temperature=0.3,
+        stream=True,
+    )
+    # Each streamed chunk carries an incremental piece of the assistant's reply
+    parts = [chunk.choices[0].delta.content or "" for chunk in response if chunk.choices]
+    return "".join(parts).strip()
 
 
 def summarize_text(text: str, max_tokens: int = 150, model: str = "gpt-3.5-turbo") -> str:
@@ -39,18 +97,58 @@ def summarize_text(text: str, max_tokens: int = 150, model: str = "gpt-3.5-turbo
     RuntimeError
         If the OPENAI_API_KEY environment variable is not set.
     """
-    api_key: Optional[str] = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        raise RuntimeError("OPENAI_API_KEY environment variable not set. Please set it to your OpenAI API key.")
-    openai.api_key = api_key
-    response = openai.ChatCompletion.create(
-        model=model,
-        messages=[
-            {"role": "system", "content": "You are a helpful assistant that summarizes meeting transcripts."},
-            {"role": "user", "content": text},
-        ],
-        max_tokens=max_tokens,
-        temperature=0.3,
-    )
-    # Extract the content of the assistant's reply
-    return response["choices"][0]["message"]["content"].strip()
\ No newline at end of file
+    return _complete(_SUMMARY_PROMPT, text, max_tokens, model)
+
+
+def summarize_segments(
+    segments: Iterable[str],
+    chunk_tokens: int = 1500,
+    max_tokens: int = 150,
+    model: str = "gpt-3.5-turbo",
+) -> str:
+    """
+    Summarize a stream of transcript segments in chunks, then combine the results.
+
+    Segments are buffered until roughly ``chunk_tokens`` tokens have
+    accumulated, and each full chunk is summarized in the background while
+    further segments are still being consumed. The partial summaries are
+    then merged in a final request.
+
+    Parameters
+    ----------
+    segments: Iterable[str]
+        Transcript segments in order, e.g. as yielded by the transcriber.
+    chunk_tokens: int, optional
+        Approximate number of input tokens per chunk. Defaults to 1500.
+    max_tokens: int, optional
+        Maximum number of tokens in each summary output. Defaults to 150.
+    model: str, optional
+        The chat model to use. Defaults to "gpt-3.5-turbo".
+
+    Returns
+    -------
+    str
+        The combined summary text.
+
+    Raises
+    ------
+    RuntimeError
+        If the OPENAI_API_KEY environment variable is not set.
+    """
+    chunk_chars = chunk_tokens * CHARS_PER_TOKEN
+    partials: List[Future] = []
+    buffer: List[str] = []
+    size = 0
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        for text in segments:
+            buffer.append(text)
+            size += len(text)
+            if size >= chunk_chars:
+                partials.append(executor.submit(summarize_text, " ".join(buffer), max_tokens, model))
+                buffer, size = [], 0
+        if buffer or not partials:
+            partials.append(executor.submit(summarize_text, " ".join(buffer), max_tokens, model))
+        summaries = [future.result() for future in partials]
+    if len(summaries) == 1:
+        return summaries[0]
+    return _complete(_COMBINE_PROMPT, "\n\n".join(summaries), max_tokens, model)
@@ -2,18 +2,257 @@
 Tracker module for the Office Assistant prototype.
 
 This module provides a simple interface to log which window is
-active over a period of time. It uses the pygetwindow library
-to determine the active window title. The primary function,
-track_activity, returns a list of dictionaries capturing the
-timestamp and window title at regular intervals. Consumers can
-persist this list or further process it as needed.
+active over a period of time. The primary function, track_activity,
+returns a list of dictionaries capturing the timestamp and window
+title each time the foreground window or its title changes. On
+Windows this is driven by foreground and name-change event hooks, and
+on X11 by property change events for _NET_ACTIVE_WINDOW on the root
+window and for the title of the active window, so no work is done
+between changes. On macOS the frontmost window is polled
+through Quartz at regular intervals, and on any other platform the
+pygetwindow library is polled; in both cases only changes are recorded.
+The platform libraries are imported only when tracking starts, so the
+module itself imports everywhere. Consumers can persist this
+list or further process it as needed. For long sessions, log_activity
+streams the same records straight to a JSON file instead of keeping
+them in memory.
 """
 
 from __future__ import annotations
 
+import os
+import select
+import sys
 import time
-from typing import Any, Dict, List
-import pygetwindow
+from typing import Any, Callable, Dict, List, Optional
+import orjson
+
+# Win32 constants used by the foreground and title-change event hooks
+EVENT_SYSTEM_FOREGROUND = 0x0003
+EVENT_OBJECT_NAMECHANGE = 0x800C
+OBJID_WINDOW = 0
+CHILDID_SELF = 0
+WINEVENT_OUTOFCONTEXT = 0x0000
+QS_ALLINPUT = 0x04FF
+PM_REMOVE = 0x0001
+
+
+def _on_change(emit: Callable[[Dict[str, Any]], None]) -> Callable[[str], None]:
+    """
+    Wrap ``emit`` so a record is only produced when the title differs from the previous one.
+    """
+    last_title: Optional[str] = None
+
+    def record(title: str) -> None:
+        nonlocal last_title
+        if title == last_title:
+            return
+        last_title = title
+        emit({
+            "timestamp": time.time(),
+            "title": title,
+        })
+
+    return record
+
+
+def _track_foreground_events(duration: int, record: Callable[[str], None]) -> None:
+    """
+    Record foreground window and title changes on Windows via SetWinEventHook.
+
+    The calling thread pumps its message queue until ``duration`` seconds
+    have elapsed. One hook fires when focus changes; a second fires on
+    window name changes, of which only those of the foreground window
+    itself are recorded (e.g. a browser switching tabs).
+    """
+    import ctypes
+    from ctypes import wintypes
+
+    user32 = ctypes.windll.user32
+    WinEventProc = ctypes.WINFUNCTYPE(
+        None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+        wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD,
+    )
+    user32.SetWinEventHook.argtypes = [
+        wintypes.DWORD, wintypes.DWORD, wintypes.HMODULE, WinEventProc,
+        wintypes.DWORD, wintypes.DWORD, wintypes.DWORD,
+    ]
+    user32.SetWinEventHook.restype = wintypes.HANDLE
+    user32.UnhookWinEvent.argtypes = [wintypes.HANDLE]
+    user32.GetForegroundWindow.restype = wintypes.HWND
+    user32.GetWindowTextLengthW.argtypes = [wintypes.HWND]
+    user32.GetWindowTextW.argtypes = [wintypes.HWND, wintypes.LPWSTR, ctypes.c_int]
+
+    def window_title(hwnd: int) -> str:
+        if not hwnd:
+            return "Unknown"
+        length = user32.GetWindowTextLengthW(hwnd)
+        buffer = ctypes.create_unicode_buffer(length + 1)
+        user32.GetWindowTextW(hwnd, buffer, length + 1)
+        return buffer.value
+
+    def on_event(hook, event, hwnd, id_object, id_child, thread_id, event_time):
+        if event == EVENT_OBJECT_NAMECHANGE and (
+            id_object != OBJID_WINDOW or id_child != CHILDID_SELF or hwnd != user32.GetForegroundWindow()
+        ):
+            return
+        record(window_title(hwnd))
+
+    # Keep a reference to the ctypes callback so it is not garbage collected while hooked
+    callback = WinEventProc(on_event)
+    hooks = []
+    try:
+        for event in (EVENT_SYSTEM_FOREGROUND, EVENT_OBJECT_NAMECHANGE):
+            hook = user32.SetWinEventHook(event, event, None, callback, 0, 0, WINEVENT_OUTOFCONTEXT)
+            if not hook:
+                raise ctypes.WinError()
+            hooks.append(hook)
+        record(window_title(user32.GetForegroundWindow()))
+        msg = wintypes.MSG()
+        end_time = time.time() + duration
+        while (remaining := end_time - time.time()) > 0:
+            # Sleep until a message arrives or the tracking period ends
+            user32.MsgWaitForMultipleObjects(0, None, False, int(remaining * 1000), QS_ALLINPUT)
+            while user32.PeekMessageW(ctypes.byref(msg), None, 0, 0, PM_REMOVE):
+                user32.TranslateMessage(ctypes.byref(msg))
+                user32.DispatchMessageW(ctypes.byref(msg))
+    finally:
+        for hook in hooks:
+            user32.UnhookWinEvent(hook)
+
+
+def _track_x11_events(duration: int, record: Callable[[str], None]) -> None:
+    """
+    Record active window and title changes on X11 via PropertyNotify events.
+
+    The root window's _NET_ACTIVE_WINDOW property is watched, as are the
+    _NET_WM_NAME and WM_NAME properties of whichever window is currently
+    active, so the X connection is only read when the window manager or
+    the active window reports a change.
+    """
+    from Xlib import X, Xatom, display
+    from Xlib.error import XError
+
+    disp = display.Display()
+    try:
+        root = disp.screen().root
+        net_active_window = disp.intern_atom("_NET_ACTIVE_WINDOW")
+        net_wm_name = disp.intern_atom("_NET_WM_NAME")
+        utf8_string = disp.intern_atom("UTF8_STRING")
+
+        name_atoms = (net_wm_name, Xatom.WM_NAME)
+        active: Optional[Any] = None
+
+        def window_title(win: Optional[Any]) -> str:
+            if win is None:
+                return "Unknown"
+            try:
+                name = win.get_full_property(net_wm_name, utf8_string)
+                if name and name.value:
+                    value = name.value
+                    return value.decode("utf-8", "replace") if isinstance(value, bytes) else str(value)
+                return win.get_wm_name() or ""
+            except XError:
+                # The window can disappear between the event and the query
+                return "Unknown"
+
+        def follow_active_window() -> None:
+            nonlocal active
+            prop = root.get_full_property(net_active_window, X.AnyPropertyType)
+            window_id = prop.value[0] if prop and prop.value else 0
+            if active is not None and active.id != window_id:
+                try:
+                    active.change_attributes(event_mask=X.NoEventMask)
+                except XError:
+                    pass
+            active = disp.create_resource_object("window", window_id) if window_id else None
+            if active is not None:
+                try:
+                    # Watch the new active window's own properties for title changes
+                    active.change_attributes(event_mask=X.PropertyChangeMask)
+                except XError:
+                    active = None
+            record(window_title(active))
+
+        root.change_attributes(event_mask=X.PropertyChangeMask)
+        follow_active_window()
+        end_time = time.time() + duration
+        while (remaining := end_time - time.time()) > 0:
+            # Sleep until the X server sends something or the tracking period ends
+            if not disp.pending_events():
+                select.select([disp], [], [], remaining)
+            while disp.pending_events():
+                event = disp.next_event()
+                if event.type != X.PropertyNotify:
+                    continue
+                if event.window.id == root.id and event.atom == net_active_window:
+                    follow_active_window()
+                elif active is not None and event.window.id == active.id and event.atom in name_atoms:
+                    record(window_title(active))
+    finally:
+        disp.close()
+
+
+def _quartz_front_window_title() -> str:
+    """
+    Return "<application> - <window title>" for the frontmost window on macOS.
+
+    CGWindowList is used rather than NSWorkspace activation notifications
+    because those are only delivered while a main-thread run loop is
+    spinning, which this command-line tool never does.
+    """
+    import Quartz
+
+    windows = Quartz.CGWindowListCopyWindowInfo(
+        Quartz.kCGWindowListOptionOnScreenOnly | Quartz.kCGWindowListExcludeDesktopElements,
+        Quartz.kCGNullWindowID,
+    )
+    # The list is ordered front to back; layer 0 holds normal application windows
+    for info in windows or []:
+        if info.get(Quartz.kCGWindowLayer) == 0:
+            owner = info.get(Quartz.kCGWindowOwnerName, "")
+            # Window names are only visible with the screen recording permission
+            name = info.get(Quartz.kCGWindowName)
+            return f"{owner} - {name}" if name else owner
+    return "Unknown"
+
+
+def _pygetwindow_title() -> str:
+    """
+    Return the active window title as reported by pygetwindow.
+    """
+    import pygetwindow
+
+    # Query the currently active window. Some systems may return None.
+    win = pygetwindow.getActiveWindow()
+    return win.title if win else "Unknown"
+
+
+def _poll_active_window(
+    duration: int, interval: float, record: Callable[[str], None], active_title: Callable[[], str]
+) -> None:
+    """
+    Record the active window title by calling ``active_title`` every ``interval`` seconds.
+    """
+    end_time = time.time() + duration
+    while time.time() < end_time:
+        record(active_title())
+        time.sleep(interval)
+
+
+def _track(duration: int, interval: float, emit: Callable[[Dict[str, Any]], None]) -> None:
+    """
+    Pass a record to ``emit`` each time the active window changes.
+    """
+    record = _on_change(emit)
+    if sys.platform == "win32":
+        _track_foreground_events(duration, record)
+    elif sys.platform == "darwin":
+        _poll_active_window(duration, interval, record, _quartz_front_window_title)
+    elif os.environ.get("DISPLAY"):
+        _track_x11_events(duration, record)
+    else:
+        _poll_active_window(duration, interval, record, _pygetwindow_title)
 
 
 def track_activity(duration: int, interval: float = 1.0) -> List[Dict[str, Any]]:
@@ -25,22 +264,54 @@ def track_activity(duration: int, interval: float = 1.0) -> List[Dict[str, Any]]
     duration: int
         Duration to track in seconds.
     interval: float, optional
-        Number of seconds between checks. Defaults to 1.0.
+        Number of seconds between checks when polling. Ignored on Windows
+        and X11, where focus changes are delivered as events. Defaults to 1.0.
 
     Returns
     -------
     List[Dict[str, Any]]
-        A list of records containing timestamp and window title.
+        A list of records containing timestamp and window title, one per
+        change of the active window.
     """
     records: List[Dict[str, Any]] = []
-    end_time = time.time() + duration
-    while time.time() < end_time:
-        # Query the currently active window. Some systems may return None.
-        win = pygetwindow.getActiveWindow()
-        title = win.title if win else "Unknown"
-        records.append({
-            "timestamp": time.time(),
-            "title": title,
-        })
-        time.sleep(interval)
-    return records
\ No newline at end of file
+    _track(duration, interval, records.append)
+    return records
+
+
+def log_activity(path: str, duration: int, interval: float = 1.0) -> int:
+    """
+    Track the active window title and stream each record to a JSON file.
+
+    The file is a JSON array with one compact record per line. Records are
+    written as they occur, so memory use does not grow with the duration.
+
+    Parameters
+    ----------
+    path: str
+        Output JSON file path.
+    duration: int
+        Duration to track in seconds.
+    interval: float, optional
+        Number of seconds between checks when polling. Ignored on Windows
+        and X11, where focus changes are delivered as events. Defaults to 1.0.
+
+    Returns
+    -------
+    int
+        The number of records written.
+    """
+    count = 0
+    with open(path, "wb") as f:
+        f.write(b"[\n")
+
+        def emit(entry: Dict[str, Any]) -> None:
+            nonlocal count
+            f.write((b",\n" if count else b"") + orjson.dumps(entry))
+            f.flush()
+            count += 1
+
+        try:
+            _track(duration, interval, emit)
+        finally:
+            f.write(b"\n]\n")
+    return count